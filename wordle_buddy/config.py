@@ -1,8 +1,19 @@
 # config.py
+import os
 
 WORD_BANK_FILE_PATHS = {
     'austrian': 'word_banks/austrian_word_bank.npy',
     'english': 'word_banks/english_word_bank.npy',
     'german': 'word_banks/german_word_bank.npy',
     'spanish': 'word_banks/spanish_word_bank.npy'
-}
\ No newline at end of file
+}
+
+# Generated data (e.g. pattern tables) that is too large to ship with the package
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+    'wordle_buddy'
+)
+
+# Part of the key of cached results (e.g. opening guesses); bump it whenever scoring changes
+# so results computed by an older version are not reused after an upgrade
+CACHE_VERSION = 1
@@ -1,9 +1,20 @@
+import hashlib
+import json
+import os
+
 import numpy as np
 
+from wordle_buddy.config import CACHE_DIR, CACHE_VERSION
 from wordle_buddy.utils.word_bank_manager import WordBankManager
 from wordle_buddy.utils.word_scorer_entropy import WordScorerEntropy
 from wordle_buddy.utils.hyperparameters import Hyperparameters
 
+# Opening guesses already read from (or written to) the on-disk cache in this process, by cache key
+_opening_guesses = {}
+
+# Returned instead of guesses when no word scores positively
+_NO_VIABLE_GUESSES = 'No Viable Guesses'
+
 
 class WordleGuesser:
     """
@@ -19,6 +30,8 @@ class WordleGuesser:
             - language: The language of the word bank (e.g., 'english', 'german', 'austrian', 'spanish').
             - hparams: Hyperparameters object for entropy calculations.
         """
+        self.language = language
+        self.hparams = hparams
         self.word_bank = WordBankManager(language)  # Load word bank
         self.scorer = WordScorerEntropy(self.word_bank, hparams)  # Attach entropy-based scorer
 
@@ -57,9 +70,56 @@ class WordleGuesser:
         :param num_best_guesses: Number of best guesses to return.
         :return: A list of the best words as strings, sorted by entropy score.
         """
+        if not self.attempts:
+            # The opening move doesn't depend on any feedback, so it is cached on disk
+            return self._cached_opening_guesses(num_best_guesses)
+        if len(self.word_bank.possible_indices) == 1:
+            # Only the answer is left, there is nothing to score
+            return [self.word_bank.decode_word(self.word_bank.possible_word_bank[0])]
+        return self._rank_guesses(num_best_guesses)
+
+    def _opening_cache_path(self, num_best_guesses: int) -> str:
+        """Cache file for the opening guesses, keyed by everything the opening depends on."""
+        key = hashlib.sha1(repr((CACHE_VERSION, self.language, self.hparams, num_best_guesses)).encode())
+        key.update(self.word_bank.full_word_bank.tobytes())  # Invalidate when the word bank changes
+        return os.path.join(CACHE_DIR, f"opening_{key.hexdigest()}.json")
+
+    def _cached_opening_guesses(self, num_best_guesses: int) -> list:
+        """Returns the opening guesses from the on-disk cache, computing and storing them on a miss."""
+        memo_key = repr((self.language, self.hparams, num_best_guesses))
+        if memo_key in _opening_guesses:
+            return list(_opening_guesses[memo_key])  # Skips hashing the word bank and reading the file again
+
+        best_guesses = self._load_opening_guesses(num_best_guesses)
+        if best_guesses != [_NO_VIABLE_GUESSES]:
+            _opening_guesses[memo_key] = best_guesses
+        return list(best_guesses)
+
+    def _load_opening_guesses(self, num_best_guesses: int) -> list:
+        """Reads the opening guesses from the on-disk cache, computing and storing them on a miss."""
+        cache_path = self._opening_cache_path(num_best_guesses)
+        try:
+            with open(cache_path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            pass  # Missing or unreadable cache entry
+
+        best_guesses = self._rank_guesses(num_best_guesses)
+        if best_guesses == [_NO_VIABLE_GUESSES]:
+            return best_guesses  # Not an answer worth keeping, the next run should try again
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as file:
+                json.dump(best_guesses, file, ensure_ascii=False)
+        except OSError:
+            pass  # Caching is best-effort (e.g. read-only home directory)
+        return best_guesses
+
+    def _rank_guesses(self, num_best_guesses: int) -> list:
+        """Scores the current word bank and returns the top `num_best_guesses` words."""
         if self.word_bank.possible_word_bank.size == 0:
             # the word bank is empty, something horrible has happened
-            return ['No Viable Guesses']
+            return [_NO_VIABLE_GUESSES]
 
         scores = self.scorer.score_word_bank(attempt_num=len(self.attempts) + 1)
         num_available = len(self.scorer.current_word_bank)
@@ -67,7 +127,13 @@ class WordleGuesser:
         # Ensure we don't request more than available words
         num_best_guesses = min(num_best_guesses, num_available)
 
-        best_indices = np.argsort(scores)[::-1][:num_best_guesses]
+        # Only the top `num_best_guesses` need ordering, so partition in O(N) and sort just those
+        # (nothing to partition away when every word is requested)
+        if num_best_guesses < len(scores):
+            top_indices = np.argpartition(scores, -num_best_guesses)[-num_best_guesses:]
+        else:
+            top_indices = np.arange(len(scores))
+        best_indices = top_indices[np.argsort(scores[top_indices])[::-1]][:num_best_guesses]
         best_guesses_ascii = [
             self.scorer.working_word_bank[i]
             for i in best_indices
@@ -77,7 +143,7 @@ class WordleGuesser:
 
         if not best_guesses_chars:
             # there was no positive score, something horrible has happened
-            return ['No Viable Guesses']
+            return [_NO_VIABLE_GUESSES]
         # Return best guesses as a list of strings
         return best_guesses_chars
 
@@ -1,10 +1,10 @@
+from wordle_buddy.config import WORD_BANK_FILE_PATHS
 from wordle_buddy.guesser import WordleGuesser
-import numpy as np
 import time
 
 
 def prompt_language_selection() -> str:
-    language_options = ["english", "german", "austrian", "spanish"]
+    language_options = list(WORD_BANK_FILE_PATHS)
     print("\nPick a language from the following:")
     print(f"\t{', '.join(language_options).title()}")
 
@@ -47,8 +47,7 @@ class WordleTerminalHelper:
             if len(encoded_word) != 5 or encoded_word.min() < 0:
                 print(f"Sorry, `{word}` was not valid, please try again :)")
                 continue
-            encoded_word_in_wordbank = np.any(np.all(self.wordle_guesser.word_bank.full_word_bank == encoded_word, axis=1))
-            if not encoded_word_in_wordbank:
+            if not self.wordle_guesser.word_bank.contains_word(encoded_word):
                 print(f"Sorry, `{word}` was not valid, please try again :)")
 
             break
@@ -0,0 +1,9 @@
+import importlib
+
+
+def _optional_kernels(module_name: str):
+    """
+    Imports one of the optional kernel modules (`_cull_numba`, `_scoring_numba`, `_scoring_cupy`) on first use,
+    so `import wordle_buddy` doesn't pay for importing Numba or CuPy.
+    """
+    return importlib.import_module(f"{__name__}.{module_name}")
@@ -0,0 +1,71 @@
+"""
+Optional Numba kernel for WordBankManager.cull.
+
+Numba is not a hard dependency; when it cannot be imported `_NUMBA_AVAILABLE` is False
+and the word bank keeps using its vectorized NumPy path.
+"""
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+YELLOW, GREEN = 1, 2
+
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def cull_kernel(word_bank: NDArray, possible_indices: NDArray, guess: NDArray, trits: NDArray, keep: NDArray) -> None:
+        """
+        Marks in `keep` the possible words that would give exactly the observed feedback `trits` for `guess`.
+
+        Same two-pass rule as `feedback_patterns.pattern_ids`, computed per word with an early exit
+        on the first mismatching letter, so no (words x letters x letters) temporaries are built.
+        """
+        word_length = word_bank.shape[1]
+        for row in range(len(possible_indices)):
+            word = possible_indices[row]  # Indexed as word_bank[word, pos], slicing a row view per word is slow
+            matches = True
+
+            # Greens alone reject most words, check them before any counting
+            for pos in range(word_length):
+                if (word_bank[word, pos] == guess[pos]) != (trits[pos] == GREEN):
+                    matches = False
+                    break
+
+            if matches:
+                for pos in range(word_length):
+                    if trits[pos] == GREEN:
+                        continue
+
+                    # Copies of the letter among the word's non-green letters...
+                    available = 0
+                    for other_pos in range(word_length):
+                        if word_bank[word, other_pos] == guess[pos] and word_bank[word, other_pos] != guess[other_pos]:
+                            available += 1
+                    # ...minus those claimed by earlier non-green copies in the guess
+                    claimed = 0
+                    for earlier_pos in range(pos):
+                        if guess[earlier_pos] == guess[pos] and trits[earlier_pos] != GREEN:
+                            claimed += 1
+
+                    if (claimed < available) != (trits[pos] == YELLOW):
+                        matches = False
+                        break
+
+            keep[row] = matches
+
+
+def warmup() -> None:
+    """Compiles (or loads from cache) the kernel on a 1-row input so the first real guess isn't slowed down."""
+    if not _NUMBA_AVAILABLE:
+        return
+    word_length = 5
+    cull_kernel(
+        np.zeros((1, word_length), dtype=np.uint8), np.zeros(1, dtype=np.int32),
+        np.zeros(word_length, dtype=np.int64), np.zeros(word_length, dtype=np.int8),
+        np.empty(1, dtype=bool)
+    )
@@ -0,0 +1,130 @@
+"""
+Optional CuPy (CUDA) kernel for scoring guesses from the pattern table.
+
+Experimental and opt-in (`Hyperparameters.pattern_entropy_gpu`). CuPy is not a hard dependency;
+when it cannot be imported, no CUDA device is present, or `verify` finds the GPU entropies differ
+from the CPU ones, `ready` is False and `feedback_patterns.table_entropies` stays on the CPU.
+Check a machine by hand with:
+
+    python -m wordle_buddy.utils._scoring_cupy
+"""
+import warnings
+
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    import cupy as cp
+    _CUPY_AVAILABLE = cp.cuda.runtime.getDeviceCount() > 0
+except Exception:  # Not installed, or installed without a usable driver/device
+    _CUPY_AVAILABLE = False
+
+# Threads per block; each block histograms one guess row
+_BLOCK_SIZE = 256
+
+_TABLE_ENTROPIES_SOURCE = r"""
+extern "C" __global__
+void table_entropies(const unsigned char* pattern_table, const long long num_words,
+                     const long long* guess_rows, const int* answer_columns, const int num_answers,
+                     const int total_patterns, double* out) {
+    extern __shared__ int counts[];
+    for (int k = threadIdx.x; k < total_patterns; k += blockDim.x) {
+        counts[k] = 0;
+    }
+    __syncthreads();
+
+    const unsigned char* row = pattern_table + guess_rows[blockIdx.x] * num_words;
+    for (int answer = threadIdx.x; answer < num_answers; answer += blockDim.x) {
+        atomicAdd(&counts[row[answer_columns[answer]]], 1);
+    }
+    __syncthreads();
+
+    if (threadIdx.x == 0) {
+        double entropy = 0.0;
+        for (int k = 0; k < total_patterns; k++) {
+            if (counts[k] > 0) {
+                double p = (double)counts[k] / num_answers;
+                entropy -= p * log2(p);
+            }
+        }
+        out[blockIdx.x] = entropy;
+    }
+}
+"""
+
+_kernel = None
+
+# Result of `verify` on this machine, checked on first use
+_verified = None
+
+# Host table and its device copy, for the last table scored. Only one table is kept on the GPU
+# (about 220 MB for English); scoring a different table replaces it, freeing the previous copy
+_device_table_cache = (None, None)
+
+
+def _device_table(pattern_table: NDArray):
+    """Uploads a pattern table to the GPU, reusing the copy while the same table keeps being scored."""
+    global _device_table_cache
+    if _device_table_cache[0] is not pattern_table:
+        _device_table_cache = (None, None)  # Free the previous copy before allocating the next one
+        _device_table_cache = (pattern_table, cp.asarray(np.ascontiguousarray(pattern_table)))
+    return _device_table_cache[1]
+
+
+def table_entropies_gpu(pattern_table: NDArray, guess_rows: NDArray, answer_columns: NDArray, total_patterns: int) -> NDArray:
+    """
+    Same as `feedback_patterns.table_entropies` for a uint8 pattern table, with one CUDA block per guess row
+    histogramming the row in shared memory.
+
+    :return: (len(guess_rows),) NumPy array of entropies.
+    """
+    global _kernel
+    if _kernel is None:
+        _kernel = cp.RawKernel(_TABLE_ENTROPIES_SOURCE, 'table_entropies')
+
+    table = _device_table(pattern_table)
+    entropies = cp.empty(len(guess_rows), dtype=cp.float64)
+    _kernel(
+        (len(guess_rows),), (_BLOCK_SIZE,),
+        (
+            table, np.int64(table.shape[1]),
+            cp.asarray(guess_rows, dtype=cp.int64), cp.asarray(answer_columns, dtype=cp.int32),
+            np.int32(len(answer_columns)), np.int32(total_patterns), entropies
+        ),
+        shared_mem=total_patterns * np.dtype(np.int32).itemsize
+    )
+    return cp.asnumpy(entropies)
+
+
+def verify(num_words: int = 300, seed: int = 0) -> bool:
+    """Checks the GPU entropies against the CPU ones (Numba or NumPy) on a small random pattern table."""
+    from wordle_buddy.utils.feedback_patterns import num_patterns, table_entropies
+
+    rng = np.random.default_rng(seed)
+    total_patterns = num_patterns(5)
+    pattern_table = rng.integers(0, total_patterns, size=(num_words, num_words), dtype=np.uint8)
+    guess_rows = np.arange(num_words)
+    answer_columns = np.sort(rng.choice(num_words, size=num_words // 2, replace=False)).astype(np.int32)
+
+    expected = table_entropies(pattern_table, guess_rows, answer_columns, 5)
+    actual = table_entropies_gpu(pattern_table, guess_rows, answer_columns, total_patterns)
+    return bool(np.allclose(actual, expected, rtol=0, atol=1e-9))
+
+
+def ready() -> bool:
+    """Whether scoring can run on the GPU: CuPy and a device are present and `verify` passed."""
+    global _verified
+    if not _CUPY_AVAILABLE:
+        return False
+    if _verified is None:
+        _verified = verify()
+        if not _verified:
+            warnings.warn("GPU pattern entropies don't match the CPU ones, scoring stays on the CPU.", RuntimeWarning)
+    return _verified
+
+
+if __name__ == "__main__":
+    if not _CUPY_AVAILABLE:
+        print("CuPy or a CUDA device is not available.")
+    else:
+        print("GPU entropies match the CPU ones." if verify() else "GPU entropies do NOT match the CPU ones.")
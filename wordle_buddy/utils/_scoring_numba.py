@@ -0,0 +1,144 @@
+"""
+Optional Numba kernels for WordScorerEntropy.
+
+Numba is not a hard dependency; when it cannot be imported `_NUMBA_AVAILABLE` is False
+and the scorer keeps using its vectorized NumPy path.
+"""
+import numpy as np
+from numpy.typing import NDArray
+
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+
+if _NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def word_entropies_kernel(
+            word_bank: NDArray, green_entropy: NDArray, yellow_entropy: NDArray, white_entropy: NDArray, out: NDArray
+    ) -> None:
+        """
+        Writes the penalized entropy of every letter of every word into `out` (same shape as `word_bank`).
+
+        Mirrors the NumPy path of `WordScorerEntropy._apply_hyperparameters` operation for operation,
+        counting repeated letters in registers instead of through an (N, chars) frequency matrix.
+        """
+        num_words, word_length = word_bank.shape
+        for i in prange(num_words):
+            for pos in range(word_length):
+                char = word_bank[i, pos]
+                char_frequency = 0
+                for other_pos in range(word_length):
+                    if word_bank[i, other_pos] == char:
+                        char_frequency += 1
+
+                yellow_penalty = (1 + (1 / char_frequency)) / 2
+                white_penalty = 1 / char_frequency
+                out[i, pos] = (
+                        green_entropy[char, pos] +
+                        yellow_entropy[char, pos] * yellow_penalty +
+                        white_entropy[char, pos] * white_penalty
+                )
+
+
+    @njit(cache=True)
+    def letter_frequencies_kernel(word_bank: NDArray, out: NDArray) -> None:
+        """
+        Counts each character at each position of the word bank into `out` (chars x positions) in a
+        single pass over the words, instead of one bincount pass per position.
+        """
+        out[:] = 0
+        num_words, word_length = word_bank.shape
+        if word_length == 5:
+            # Wordle's fixed word length, unrolled so the compiler sees five independent increments per word
+            for i in range(num_words):
+                out[word_bank[i, 0], 0] += 1
+                out[word_bank[i, 1], 1] += 1
+                out[word_bank[i, 2], 2] += 1
+                out[word_bank[i, 3], 3] += 1
+                out[word_bank[i, 4], 4] += 1
+        else:
+            for i in range(num_words):
+                for pos in range(word_length):
+                    out[word_bank[i, pos], pos] += 1
+
+    @njit(cache=True, nogil=True)
+    def _pattern_id(guesses: NDArray, guess: int, answers: NDArray, answer: int) -> int:
+        """
+        Pattern id of one (guess, answer) pair, with the same two-pass rule as `feedback_patterns.pattern_ids`:
+        a non-green letter is yellow while the answer's non-green copies outnumber its earlier non-green copies.
+        """
+        word_length = guesses.shape[1]
+        pattern_id = 0
+        for pos in range(word_length):
+            letter = guesses[guess, pos]
+            trit = 0
+            if answers[answer, pos] == letter:
+                trit = 2
+            else:
+                available = 0
+                for other_pos in range(word_length):
+                    if answers[answer, other_pos] == letter and answers[answer, other_pos] != guesses[guess, other_pos]:
+                        available += 1
+                claimed = 0
+                for earlier_pos in range(pos):
+                    if guesses[guess, earlier_pos] == letter and answers[answer, earlier_pos] != letter:
+                        claimed += 1
+                if claimed < available:
+                    trit = 1
+            pattern_id = pattern_id * 3 + trit
+        return pattern_id
+
+    # Not parallel=True: this is called from the `feedback_patterns.parallel_map` worker threads,
+    # so it releases the GIL instead and lets the thread pool spread the work
+    @njit(cache=True, nogil=True)
+    def pattern_ids_kernel(guesses: NDArray, answers: NDArray, out: NDArray) -> None:
+        """Writes the pattern id of every guess against every answer into `out` (guesses x answers)."""
+        for guess in range(len(guesses)):
+            for answer in range(len(answers)):
+                out[guess, answer] = _pattern_id(guesses, guess, answers, answer)
+
+    @njit(parallel=True, cache=True)
+    def table_entropies_kernel(
+            pattern_table: NDArray, guess_rows: NDArray, answer_columns: NDArray, total_patterns: int, out: NDArray
+    ) -> None:
+        """
+        Writes the entropy of each guess row's feedback pattern distribution over `answer_columns`
+        into `out`, histogramming straight from the (memory-mapped) table rows in parallel over guesses.
+        """
+        num_answers = len(answer_columns)
+        for i in prange(len(guess_rows)):
+            row = pattern_table[guess_rows[i]]
+            counts = np.zeros(total_patterns, dtype=np.int64)
+            for answer in range(num_answers):
+                counts[row[answer_columns[answer]]] += 1
+
+            entropy = 0.0
+            for count in counts:
+                if count > 0:
+                    p = count / num_answers
+                    entropy -= p * np.log2(p)
+            out[i] = entropy
+
+
+def warmup() -> None:
+    """Compiles (or loads from cache) the positional scoring kernels on a 1-row input so the first real turn isn't slowed down."""
+    if not _NUMBA_AVAILABLE:
+        return
+    word_bank = np.zeros((1, 5), dtype=np.uint8)
+    entropy = np.zeros((1, 5))
+    word_entropies_kernel(word_bank, entropy, entropy, entropy, np.empty((1, 5)))
+    letter_frequencies_kernel(word_bank, np.empty((1, 5), dtype=np.int32))
+
+
+def warmup_pattern_kernels() -> None:
+    """Same as `warmup`, for the feedback pattern kernels only the pattern entropy reranking uses."""
+    if not _NUMBA_AVAILABLE:
+        return
+    word_bank = np.zeros((1, 5), dtype=np.uint8)
+    pattern_ids_kernel(word_bank, word_bank, np.empty((1, 1), dtype=np.uint8))
+    pattern_table = np.zeros((1, 1), dtype=np.uint8)
+    pattern_table.flags.writeable = False  # Cached tables are memory-mapped read-only
+    table_entropies_kernel(pattern_table, np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int32), 243, np.empty(1))
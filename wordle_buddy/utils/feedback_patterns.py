@@ -0,0 +1,174 @@
+"""
+Wordle feedback patterns encoded as single base-3 integers.
+
+Each letter's feedback is a trit (gray=0, yellow=1, green=2) and the first letter is the most
+significant digit, so a 5-letter pattern is an id in [0, 243) that fits in a uint8.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List
+
+import numpy as np
+from numpy.typing import NDArray
+
+from wordle_buddy.utils import _optional_kernels
+
+FEEDBACK_VALUES = {'gray': 0, 'yellow': 1, 'green': 2}
+
+# Upper bound on the (guesses x answers x letters x letters) comparison block built per chunk
+_MAX_CHUNK_ELEMENTS = 1 << 22
+
+# Below this many (guess, answer) pairs, splitting the work across threads costs more than it saves
+_PARALLEL_MIN_PAIRS = 2_000_000
+
+# Below this many (guess, answer) pairs, table scoring stays on the CPU rather than paying for GPU transfers
+_GPU_MIN_PAIRS = 2_000_000
+
+_executor = None
+
+
+def parallel_map(func: Callable, *iterables: Iterable) -> Iterator:
+    """
+    Maps `func` over `iterables` (results in order) on a shared pool with one thread per core.
+
+    Threads rather than processes: the heavy lifting happens in NumPy kernels that release the GIL,
+    and nothing has to be pickled or re-imported. Runs serially on single-core machines.
+    """
+    global _executor
+    if (os.cpu_count() or 1) < 2:
+        return map(func, *iterables)
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return _executor.map(func, *iterables)
+
+
+def num_patterns(word_length: int) -> int:
+    """Number of distinct feedback patterns for words of `word_length` letters."""
+    return 3 ** word_length
+
+
+def encode_feedback(feedback: List[str]) -> int:
+    """Converts a feedback list (e.g. ['gray', 'green', ...]) into its pattern id."""
+    pattern_id = 0
+    for color in feedback:
+        pattern_id = pattern_id * 3 + FEEDBACK_VALUES[color]
+    return pattern_id
+
+
+def pattern_ids(guesses: NDArray, answers: NDArray) -> NDArray:
+    """
+    Computes the feedback pattern id every guess would receive against every answer.
+
+    Uses the standard two-pass Wordle rule: greens first, then each remaining guess letter is
+    yellow only while the answer still has unmatched copies of it (earlier guess letters claim first).
+
+    :param guesses: (G, L) array of encoded guesses.
+    :param answers: (A, L) array of encoded answers.
+    :return: (G, A) array of pattern ids.
+    """
+    word_length = guesses.shape[1]
+    dtype = np.min_scalar_type(num_patterns(word_length) - 1)
+
+    kernels = _optional_kernels('_scoring_numba')
+    if kernels._NUMBA_AVAILABLE:
+        # Compiled per-pair loop, without the (G, A, L, L) comparison temporaries below
+        ids = np.empty((len(guesses), len(answers)), dtype=dtype)
+        kernels.pattern_ids_kernel(guesses, answers, ids)
+        return ids
+
+    greens = guesses[:, None, :] == answers[None, :, :]  # (G, A, L)
+    not_green = ~greens
+
+    # Copies of guess letter i among the answer's non-green letters
+    available = np.sum(
+        (guesses[:, None, :, None] == answers[None, :, None, :]) & not_green[:, :, None, :],
+        axis=3
+    )
+    # Copies of guess letter i at earlier non-green guess positions, which are matched first
+    earlier_same_letter = (guesses[:, :, None] == guesses[:, None, :]) & np.tri(word_length, k=-1, dtype=bool)
+    claimed = np.sum(not_green[:, :, None, :] & earlier_same_letter[:, None, :, :], axis=3)
+
+    yellows = not_green & (claimed < available)
+
+    place_values = 3 ** np.arange(word_length - 1, -1, -1)
+    trits = 2 * greens.astype(np.uint8) + yellows
+    return (trits @ place_values).astype(dtype)
+
+
+def pattern_id_matrix(guesses: NDArray, answers: NDArray) -> NDArray:
+    """
+    Same as `pattern_ids`, computed in chunks of guesses so the comparison blocks stay bounded
+    in memory (and spread across threads when there are enough pairs to be worth it).
+    """
+    num_guesses, word_length = guesses.shape
+    ids = np.empty((num_guesses, len(answers)), dtype=np.min_scalar_type(num_patterns(word_length) - 1))
+    if len(answers) == 0:
+        return ids
+
+    chunk_size = max(1, _MAX_CHUNK_ELEMENTS // (len(answers) * word_length * word_length))
+    starts = range(0, num_guesses, chunk_size)
+
+    def chunk_ids(start: int) -> NDArray:
+        return pattern_ids(guesses[start:start + chunk_size], answers)
+
+    blocks = parallel_map(chunk_ids, starts) if num_guesses * len(answers) >= _PARALLEL_MIN_PAIRS else map(chunk_ids, starts)
+    for start, block in zip(starts, blocks):
+        ids[start:start + len(block)] = block
+    return ids
+
+
+def entropies_from_ids(ids: NDArray, total_patterns: int) -> NDArray:
+    """Shannon entropy of each row of a (G, A) pattern id array."""
+    num_guesses, num_answers = ids.shape
+
+    # One histogram per guess via a single offset bincount
+    offsets = np.arange(num_guesses)[:, None] * total_patterns
+    counts = np.bincount(
+        (ids + offsets).ravel(), minlength=num_guesses * total_patterns
+    ).reshape(num_guesses, total_patterns)
+
+    p = counts / num_answers
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -np.sum(np.where(counts > 0, p * np.log2(p), 0.0), axis=1)
+
+
+def table_entropies(
+        pattern_table: NDArray, guess_rows: NDArray, answer_columns: NDArray, word_length: int, use_gpu: bool = False
+) -> NDArray:
+    """
+    Expected information gain (in bits) of each guess: the Shannon entropy of the distribution
+    of feedback patterns it produces across the answers, read from a precomputed (guess x answer) table.
+
+    :param pattern_table: (N, N) pattern ids of every word in the bank against every other word.
+    :param guess_rows: Word bank indices of the guesses to score.
+    :param answer_columns: Word bank indices of the remaining answers.
+    :param word_length: Number of letters per word.
+    :param use_gpu: Score large inputs on a CUDA GPU when CuPy is installed (experimental, off by default).
+    :return: (len(guess_rows),) array of entropies.
+    """
+    entropies = np.zeros(len(guess_rows))
+    if len(answer_columns) == 0:
+        return entropies
+
+    num_pairs = len(guess_rows) * len(answer_columns)
+    if use_gpu and pattern_table.dtype == np.uint8 and num_pairs >= _GPU_MIN_PAIRS:
+        gpu_kernels = _optional_kernels('_scoring_cupy')
+        if gpu_kernels.ready():
+            # Big enough to be worth the transfers (the last table scored stays on the GPU between calls)
+            return gpu_kernels.table_entropies_gpu(pattern_table, guess_rows, answer_columns, num_patterns(word_length))
+
+    kernels = _optional_kernels('_scoring_numba')
+    if kernels._NUMBA_AVAILABLE:
+        # Histograms the table rows in place, without gathering a (guesses x answers) block first
+        kernels.table_entropies_kernel(
+            pattern_table, np.asarray(guess_rows, dtype=np.int64), np.asarray(answer_columns, dtype=np.int32),
+            num_patterns(word_length), entropies
+        )
+        return entropies
+
+    chunk_size = max(1, _MAX_CHUNK_ELEMENTS // len(answer_columns))
+    for start in range(0, len(guess_rows), chunk_size):
+        chunk_ids = pattern_table[guess_rows[start:start + chunk_size]][:, answer_columns]
+        entropies[start:start + len(chunk_ids)] = entropies_from_ids(chunk_ids, num_patterns(word_length))
+
+    return entropies
@@ -16,6 +16,10 @@ class Hyperparameters:
         - invalid_word_decay_rate_penalty (float): Used to calculate penalty applied to words that are not valid answers
         - max_guesses (int): The maximum number of guesses allowed during the game.
         - hardcore_mode (bool): Using the full word bank or just the possible word bank as guessing possibilities
+        - pattern_entropy (bool): Rerank the best positional guesses by their true expected information gain
+        - pattern_entropy_candidates (int): Number of best positional guesses to rerank (0 reranks every guess,
+          using the cached pattern table)
+        - pattern_entropy_gpu (bool): Score the pattern table on a CUDA GPU when CuPy is installed (experimental)
     """
     vowel_pos_weights: np.ndarray = field(default_factory=lambda: np.array([1.2, 1.2, 1.2, 1.2, 1.2]))
     consonant_pos_weights: list[float] = field(default_factory=lambda: np.array([1.5, 1.0, 1.2, 1.1, 1.5]))
@@ -26,6 +30,10 @@ class Hyperparameters:
 
     hardcore_mode: bool = False
 
+    pattern_entropy: bool = False
+    pattern_entropy_candidates: int = 100
+    pattern_entropy_gpu: bool = False
+
     def __post_init__(self):
         """
         Optional validation to ensure all hparams are within valid ranges
@@ -45,6 +53,12 @@ class Hyperparameters:
             raise ValueError("Max guesses must be a positive integer.")
         if not isinstance(self.hardcore_mode, bool):
             raise ValueError("Hardcore mode must be a boolean")
+        if not isinstance(self.pattern_entropy, bool):
+            raise ValueError("Pattern entropy must be a boolean")
+        if self.pattern_entropy_candidates < 0:
+            raise ValueError("Pattern entropy candidates must be a non-negative integer.")
+        if not isinstance(self.pattern_entropy_gpu, bool):
+            raise ValueError("Pattern entropy GPU must be a boolean")
 
         # Issue a warning if max_guesses is not the conventional value of 6
         if self.max_guesses != 6:
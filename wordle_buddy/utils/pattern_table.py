@@ -0,0 +1,82 @@
+"""
+On-disk cache of the (word x word) feedback pattern table of a word bank.
+
+The table only depends on the word bank, so it is built once (it takes a while for the larger
+banks) and memory-mapped afterwards. Prebuild the tables with:
+
+    python -m wordle_buddy.utils.pattern_table english german
+"""
+import hashlib
+import os
+import sys
+import tempfile
+
+import numpy as np
+from numpy.typing import NDArray
+
+from wordle_buddy.config import CACHE_DIR
+from wordle_buddy.utils.feedback_patterns import num_patterns, parallel_map, pattern_ids
+
+# Size of the (guess rows x answer columns) tiles the table is built in: each tile's comparison
+# block stays cache-sized however large the bank is
+_BUILD_ROWS = 64
+_BUILD_COLUMNS = 512
+
+
+def pattern_table_path(language: str, word_bank: NDArray) -> str:
+    """Cache file for a word bank; the content hash invalidates tables built from an older bank."""
+    digest = hashlib.sha1(word_bank.tobytes()).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{language}_pattern_table_{digest}.npy")
+
+
+def build_pattern_table(word_bank: NDArray, path: str) -> None:
+    """Writes the pattern id of every word (row) guessed against every word (column) to `path`."""
+    num_words, word_length = word_bank.shape
+    dtype = np.min_scalar_type(num_patterns(word_length) - 1)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Each builder writes its own temporary file, so concurrent builds of the same table never share one
+    file_descriptor, partial_path = tempfile.mkstemp(
+        dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix='.partial'
+    )
+    os.close(file_descriptor)
+    try:
+        table = np.lib.format.open_memmap(partial_path, mode='w+', dtype=dtype, shape=(num_words, num_words))
+        tiles = [(row, column) for row in range(0, num_words, _BUILD_ROWS) for column in range(0, num_words, _BUILD_COLUMNS)]
+
+        def tile_ids(tile: tuple) -> NDArray:
+            row, column = tile
+            return pattern_ids(word_bank[row:row + _BUILD_ROWS], word_bank[column:column + _BUILD_COLUMNS])
+
+        for (row, column), block in zip(tiles, parallel_map(tile_ids, tiles)):
+            table[row:row + _BUILD_ROWS, column:column + _BUILD_COLUMNS] = block
+        table.flush()
+        del table
+
+        if not os.path.exists(path):  # Another process may have published the (identical) table meanwhile
+            os.replace(partial_path, path)  # Only publish complete tables
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+def load_pattern_table(language: str, word_bank: NDArray) -> NDArray:
+    """Memory-maps the cached pattern table for `word_bank`, building it first if needed."""
+    path = pattern_table_path(language, word_bank)
+    if not os.path.exists(path):
+        build_pattern_table(word_bank, path)
+    return np.load(path, mmap_mode='r')
+
+
+def main(languages: list) -> None:
+    from wordle_buddy.utils.word_bank_manager import WordBankManager
+
+    for language in languages:
+        word_bank = WordBankManager(language)
+        print(f"Building {language} pattern table ({len(word_bank.full_word_bank)} words)...")
+        load_pattern_table(language, word_bank.full_word_bank)
+        print(f"\tSaved to {pattern_table_path(language, word_bank.full_word_bank)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,9 +1,11 @@
 import numpy as np
 from numpy.typing import NDArray
-from typing import Dict, List
+from typing import List, Optional, Tuple
 import importlib.resources as pkg_resources
 
-from wordle_buddy.word_banks import __name__ as word_banks_package  # Package name reference
+from wordle_buddy.config import WORD_BANK_FILE_PATHS
+from wordle_buddy.utils import _optional_kernels
+from wordle_buddy.utils.feedback_patterns import FEEDBACK_VALUES, encode_feedback, pattern_ids
 
 
 class WordBankManager:
@@ -16,121 +18,310 @@ class WordBankManager:
         """
         Loads the word bank from the specified .npy file.
 
-        :param language: The selected language (must match a key in WORD_BANK_FILE_PATHS).
+        :param language: The selected language (must match a key in config.WORD_BANK_FILE_PATHS).
         """
+        self.language = language
         self.full_word_bank, self.ascii_converter_key = self._load_word_bank(language)
-        self.possible_word_bank = self.full_word_bank.copy()
+
+        # Character <-> code lookup tables for encode_word/decode_word (every uint8 code, and every character below)
+        self._characters = [chr(code + self.ascii_converter_key) for code in range(256)]
+        self._char_codes = {chr(value): value - self.ascii_converter_key for value in range(self.ascii_converter_key + 256)}
+
+        # The word bank's alphabet (sorted normalized character values), scanned once for every table built on it
+        self.alphabet = np.unique(self.full_word_bank)
+        self.char_map = {int(char): idx for idx, char in enumerate(self.alphabet)}
+
+        # One bit per letter of the alphabet, OR-ed together per word for O(1) "contains letter" checks
+        self.letter_bits = self._build_letter_bits(self.alphabet)
+        self.full_letter_mask = np.bitwise_or.reduce(self.letter_bits[self.full_word_bank], axis=1)
+
+        # Each word packed into one integer, a fixed-width field per letter holding its alphabet rank,
+        # so every positional check of a guess is a handful of bitwise ops on one array
+        self.letter_ranks, self.letter_field_width = self._build_letter_ranks(self.alphabet, self.full_word_bank.shape[1])
+        self.full_packed_words = self._pack_words(self.full_word_bank)
+        # Binary-searchable for word lookups, with the word bank row of each sorted entry
+        self._sorted_word_rows = np.argsort(self.full_packed_words, kind='stable')
+        self._sorted_packed_words = self.full_packed_words[self._sorted_word_rows]
+
+        # The word bank with every letter replaced by its alphabet rank, so tables indexed by letter
+        # only need one row per letter of the alphabet instead of one per character value up to the largest one
+        self.full_alphabet_word_bank = self.letter_ranks[self.full_word_bank]
+
+        # The possible words are tracked as sorted rows of full_word_bank; their words, letter masks and
+        # packed words are only gathered when needed (and cached until the next cull or reset)
+        # Shared by every reset: culls never modify the index array in place, they select a new one
+        # (left writeable, read-only arrays would make Numba compile its kernels a second time)
+        self._all_indices = np.arange(len(self.full_word_bank), dtype=np.int32)
+        self._set_possible_indices(self._all_indices)
+
+        self._pattern_table = None
+
+        # Compile the optional Numba cull kernel up front rather than on the first guess
+        _optional_kernels('_cull_numba').warmup()
+
+    @property
+    def possible_word_bank(self) -> NDArray[np.uint8]:
+        """The words that are still possible answers."""
+        if self._possible_word_bank is None:
+            self._possible_word_bank = self._gather_possible(self.full_word_bank)
+        return self._possible_word_bank
+
+    @property
+    def possible_letter_mask(self) -> NDArray:
+        """The letter-presence masks of the words that are still possible answers."""
+        if self._possible_letter_mask is None:
+            self._possible_letter_mask = self._gather_possible(self.full_letter_mask)
+        return self._possible_letter_mask
+
+    @property
+    def possible_packed_words(self) -> NDArray:
+        """The packed words (see `_pack_words`) that are still possible answers."""
+        if self._possible_packed_words is None:
+            self._possible_packed_words = self._gather_possible(self.full_packed_words)
+        return self._possible_packed_words
+
+    @property
+    def possible_alphabet_word_bank(self) -> NDArray[np.uint8]:
+        """The words that are still possible answers, as alphabet ranks (see `full_alphabet_word_bank`)."""
+        if self._possible_alphabet_word_bank is None:
+            self._possible_alphabet_word_bank = self._gather_possible(self.full_alphabet_word_bank)
+        return self._possible_alphabet_word_bank
+
+    def _gather_possible(self, full_array: NDArray) -> NDArray:
+        """Selects the possible words' rows of a per-word array (no copy while nothing has been culled)."""
+        if len(self.possible_indices) == len(self.full_word_bank):
+            return full_array  # Sorted unique indices covering every row are the identity
+        return full_array[self.possible_indices]
+
+    def is_possible(self, word_indices: NDArray) -> NDArray[np.bool_]:
+        """Checks which rows of the full word bank are still possible answers (O(1) lookup per word)."""
+        if self._possible_lookup is None:
+            # Dense per-row flags, built once per cull and shared by every lookup until the next one
+            self._possible_lookup = np.zeros(len(self.full_word_bank), dtype=bool)
+            self._possible_lookup[self.possible_indices] = True
+        return self._possible_lookup[word_indices]
+
+    @property
+    def pattern_table_loaded(self) -> bool:
+        """Whether the pattern table is already in memory (accessing `pattern_table` can otherwise build it first)."""
+        return self._pattern_table is not None
+
+    @property
+    def pattern_table(self) -> NDArray:
+        """The (word x word) feedback pattern ids of the full word bank, built and cached on first access."""
+        if self._pattern_table is None:
+            from wordle_buddy.utils.pattern_table import load_pattern_table  # Keeps `python -m` builds warning-free
+            self._pattern_table = load_pattern_table(self.language, self.full_word_bank)
+        return self._pattern_table
 
     @staticmethod
-    def _load_word_bank(language: str) -> np.ndarray:
+    def _load_word_bank(language: str) -> Tuple[NDArray[np.uint8], int]:
         """Loads and converts the word bank from the package directory."""
-        file_name = f"{language}_word_bank.npy"
+        if language not in WORD_BANK_FILE_PATHS:
+            raise ValueError(f"Unsupported language '{language}'. Choose from: {', '.join(WORD_BANK_FILE_PATHS)}.")
+        file_name = WORD_BANK_FILE_PATHS[language]
 
         try:
-            with pkg_resources.files(word_banks_package).joinpath(file_name).open("rb") as file:
+            with pkg_resources.files('wordle_buddy').joinpath(file_name).open("rb") as file:
                 word_list = np.load(file)  # Load `.npy` file
         except FileNotFoundError:
             raise FileNotFoundError(f"Word bank file '{file_name}' not found in package. Ensure it exists in `wordle_buddy/word_banks/`.")
 
-        # Convert characters to ASCII values
-        word_bank = np.array([[ord(char) for char in word] for word in word_list], dtype=np.int32)
+        # Reinterpret the fixed-width unicode strings as their code points, one column per character
+        word_bank = word_list.view(np.uint32).reshape(len(word_list), -1)
 
-        # Find the minimum ASCII value
-        min_value = word_bank.min()
+        # Find the minimum code point value
+        min_value = int(word_bank.min())
+        if int(word_bank.max()) - min_value > np.iinfo(np.uint8).max:
+            raise ValueError(f"Word bank '{file_name}' spans too many characters to be stored as uint8.")
 
-        # Normalize by subtracting the minimum ASCII value
-        normalized_word_bank = word_bank - min_value
+        # Normalize by subtracting the minimum code point value, stored as a contiguous uint8 (N, 5) array
+        normalized_word_bank = (word_bank - min_value).astype(np.uint8)
 
         return normalized_word_bank, min_value
 
     @staticmethod
-    def _find_duplicates(word: NDArray) -> Dict[int, int]:
-        """Counts occurrences of each letter in the guessed word."""
-        counts = np.bincount(word[word >= 0])
-        return {char: count for char, count in enumerate(counts) if count > 0}
-
-    def _remove_gray(self, incorrect: int) -> None:
-        """Removes words containing an incorrect letter (gray feedback)."""
-        mask = ~np.any(self.possible_word_bank == incorrect, axis=1)  # Find words without the letter
-        self.possible_word_bank = self.possible_word_bank[mask]
-
-    def _remove_green(self, index: int, letter: int) -> None:
-        """Keeps only words where the correct letter is in the exact position (green feedback)."""
-        mask = self.possible_word_bank[:, index] == letter
-        self.possible_word_bank = self.possible_word_bank[mask]
-
-    def _remove_yellow(self, index: int, letter: int,  confirmed_indices: list[int] = []) -> None:
-        """Removes words where the letter is in the wrong position but ensures it is present elsewhere (yellow feedback)."""
-        contains_letter = np.any(
-            np.delete(self.possible_word_bank, confirmed_indices, axis=1) == letter,
-            axis=1
-        )
-        wrong_position = self.possible_word_bank[:, index] != letter  # But NOT in this position
-        self.possible_word_bank = self.possible_word_bank[(contains_letter) & (wrong_position)]  # Parentheses for clarity
-
-    def _filter_by_letter_count(self, letter: int, min_count: int, max_count: int) -> None:
-        """Removes words where the letter appears more or less times than allowed."""
-        counts = (self.possible_word_bank == letter).sum(axis=1)
-        self.possible_word_bank = self.possible_word_bank[(min_count <= counts) & (counts <= max_count)]
-
-    def _regular_removal(self, letter: int, position: int, feedback: str) -> None:
+    def _build_letter_bits(alphabet: NDArray[np.uint8]) -> NDArray:
+        """Maps each normalized character value to its own bit, numbered by rank in the word bank's alphabet."""
+        if len(alphabet) > 64:
+            raise ValueError(f"Word bank alphabet has {len(alphabet)} letters, letter masks support at most 64.")
+
+        bit_dtype = np.min_scalar_type(1 << (len(alphabet) - 1))  # uint32 for alphabets up to 32 letters
+        letter_bits = np.zeros(int(alphabet[-1]) + 1, dtype=bit_dtype)
+        letter_bits[alphabet] = bit_dtype.type(1) << np.arange(len(alphabet), dtype=bit_dtype)
+        return letter_bits
+
+    def _letter_bit(self, letter: int) -> int:
+        """Returns the bit for `letter`, or 0 if the letter never appears in the word bank."""
+        return int(self.letter_bits[letter]) if 0 <= letter < len(self.letter_bits) else 0
+
+    @staticmethod
+    def _build_letter_ranks(alphabet: NDArray[np.uint8], word_length: int) -> Tuple[NDArray[np.uint8], int]:
         """
-        Applies filtering based on Wordle feedback.
+        Maps each normalized character value to its rank in the word bank's alphabet, with
+        the alphabet size standing in for characters that never appear.
 
-        :param guess: The guessed word.
-        :param information: List of feedback ('gray', 'yellow', 'green').
+        :return: The rank lookup table and the bits needed per letter (room for every rank plus the stand-in).
         """
-        if feedback == 'gray':
-            self._remove_gray(letter)  # Remove words containing this letter
-        elif feedback == 'green':
-            self._remove_green(position, letter)  # Keep words with this letter at correct position
-        elif feedback == 'yellow':
-            self._remove_yellow(position, letter)  # Keep words containing the letter but not at this position
-
-    def cull(self, guess: str, information: List[str]) -> None:
+        field_width = len(alphabet).bit_length()
+        if field_width * word_length > 64:
+            raise ValueError(f"Word bank alphabet has {len(alphabet)} letters, too many to pack a word into 64 bits.")
+
+        letter_ranks = np.full(int(alphabet[-1]) + 2, len(alphabet), dtype=np.uint8)  # Last entry is always the stand-in
+        letter_ranks[alphabet] = np.arange(len(alphabet))
+        return letter_ranks, field_width
+
+    def _letter_rank(self, letter: int) -> int:
+        """Returns the alphabet rank of `letter` (the stand-in rank if it never appears in the word bank)."""
+        return int(self.letter_ranks[letter]) if 0 <= letter < len(self.letter_ranks) else int(self.letter_ranks[-1])
+
+    def _field_shifts(self, word_length: int) -> NDArray[np.uint64]:
+        """Bit offset of each letter's field in a packed word, first letter in the most significant field."""
+        return self.letter_field_width * np.arange(word_length - 1, -1, -1, dtype=np.uint64)
+
+    def _pack_guess(self, guess: List[int]) -> int:
+        """Packs an encoded guess like `_pack_words`; letters outside the alphabet get the stand-in rank, matching no word."""
+        packed_guess = 0
+        for letter in guess:
+            packed_guess = (packed_guess << self.letter_field_width) | self._letter_rank(letter)
+        return packed_guess
+
+    def word_row(self, word: NDArray) -> Optional[int]:
+        """Row of an encoded word in the full word bank (binary search on the sorted packed words), None if absent."""
+        if len(word) != self.full_word_bank.shape[1]:
+            return None
+        packed_word = self._sorted_packed_words.dtype.type(self._pack_guess(np.asarray(word).tolist()))
+        position = np.searchsorted(self._sorted_packed_words, packed_word)
+        if position < len(self._sorted_packed_words) and self._sorted_packed_words[position] == packed_word:
+            return int(self._sorted_word_rows[position])
+        return None
+
+    def contains_word(self, word: NDArray) -> bool:
+        """Checks whether an encoded word is in the full word bank."""
+        return self.word_row(word) is not None
+
+    def _pack_words(self, words: NDArray[np.uint8]) -> NDArray:
+        """Packs the letter ranks of each word into a uint32 (or uint64 for wide alphabets), one field per letter."""
+        packed_dtype = np.uint32 if self.letter_field_width * words.shape[1] <= 32 else np.uint64
+        fields = self.letter_ranks[words].astype(np.uint64) << self._field_shifts(words.shape[1])
+        return np.bitwise_or.reduce(fields, axis=1).astype(packed_dtype)
+
+    def _set_possible_indices(self, possible_indices: NDArray) -> None:
+        """Replaces the possible words and drops the cached views of the previous ones."""
+        self.possible_indices = possible_indices
+        self._possible_word_bank = None
+        self._possible_letter_mask = None
+        self._possible_packed_words = None
+        self._possible_alphabet_word_bank = None
+        self._possible_lookup = None
+
+    def _keep(self, mask: NDArray[np.bool_]) -> None:
+        """Keeps only the possible words selected by `mask`."""
+        self._set_possible_indices(self.possible_indices[mask])
+
+    def _candidate_mask(self, guess: NDArray, trits: NDArray) -> NDArray[np.bool_]:
         """
-        Processes a Wordle guess and filters out impossible words.
+        Cheaply selects the possible words that could give the observed feedback, using only
+        per-position checks and letter masks (necessary conditions, not sufficient ones).
 
-        :param guess: The guessed word.
-        :param information: List of feedback ('gray', 'yellow', 'green').
+        The positional checks run on the packed words: XOR-ing with the packed guess zeroes the
+        fields of matching letters, so greens must leave zero fields and every other position must
+        leave a nonzero one (tested for all fields at once with the SWAR "has a zero field" trick).
         """
-        occurrences = self._find_duplicates(guess)
-        indices_dict = {char: [i for i, c in enumerate(guess) if c == char] for char in occurrences}
+        gray, yellow, green = FEEDBACK_VALUES['gray'], FEEDBACK_VALUES['yellow'], FEEDBACK_VALUES['green']
+        packed_words = self.possible_packed_words
+        packed_type = packed_words.dtype.type
+        field_ones = (1 << self.letter_field_width) - 1
+        field_shifts = [int(shift) for shift in self._field_shifts(len(guess))]
 
-        for letter, count in occurrences.items():
-            indices = indices_dict[letter]
-            feedback = [information[i] for i in indices]
+        guess, trits = guess.tolist(), trits.tolist()  # Plain ints, cheaper than NumPy scalars for 5 letters
+        non_gray_letters = {letter for letter, trit in zip(guess, trits) if trit != gray}
 
-            if len(self.possible_word_bank) == 0:
-                return
+        packed_guess = self._pack_guess(guess)
+        green_fields = other_low_bits = 0
+        required_letters = absent_letters = 0
+        for letter, trit, shift in zip(guess, trits, field_shifts):
+            if trit == green:
+                green_fields |= field_ones << shift
+                continue
 
-            if count == 1:
-                self._regular_removal(letter, indices[0], feedback[0])
-            else:
-                max_count = len(guess)
-                if 'gray' in feedback:
-                    max_count = len(feedback) - feedback.count('gray')
-                min_count = feedback.count('yellow') + feedback.count('green')
-                self._filter_by_letter_count(letter, min_count, max_count)
+            other_low_bits |= 1 << shift
+            if trit == yellow:
+                if self._letter_bit(letter) == 0:
+                    return np.zeros(len(packed_words), dtype=bool)  # No word contains a letter outside the alphabet
+                required_letters |= self._letter_bit(letter)
+            elif letter not in non_gray_letters:
+                absent_letters |= self._letter_bit(letter)  # Every copy of the letter is gray, so the answer has none
+        other_high_bits = other_low_bits << (self.letter_field_width - 1)
 
-                green_indices = [i for i, color in zip(indices, feedback) if color == 'green']
-                yellow_indices = [i for i, color in zip(indices, feedback) if color == 'yellow']
+        differences = packed_words ^ packed_type(packed_guess)
+        keep = (differences & packed_type(green_fields)) == 0  # Letters at their exact (green) positions
+        keep &= (  # ...and NOT at any other position
+            (differences - packed_type(other_low_bits)) & ~differences & packed_type(other_high_bits)
+        ) == 0
 
-                # Apply removals
-                for idx in green_indices:
-                    self._remove_green(idx, letter)
+        if required_letters:
+            keep &= (self.possible_letter_mask & required_letters) == required_letters
+        if absent_letters:
+            keep &= (self.possible_letter_mask & absent_letters) == 0
 
-                for idx in yellow_indices:
-                    self._remove_yellow(idx, letter, green_indices)
+        return keep
+
+    def cull(self, guess: NDArray, information: List[str]) -> None:
+        """
+        Processes a Wordle guess and filters out impossible words.
+
+        Keeps exactly the words that would produce the observed feedback if they were the
+        answer, in a single pass that builds one mask over the possible words. Once the pattern
+        table is loaded the feedback is read from the guess's row (when the guess is in the bank);
+        with Numba installed it is recomputed per word by a compiled kernel, otherwise a few
+        vectorized checks narrow the words down (exactly, unless the guess repeats a letter).
+
+        :param guess: The encoded guessed word.
+        :param information: List of feedback ('gray', 'yellow', 'green').
+        """
+        unknown = set(information) - set(FEEDBACK_VALUES)
+        if unknown:
+            raise ValueError(f"Unknown feedback {sorted(unknown)}. Use only: {', '.join(FEEDBACK_VALUES)}.")
+        word_length = self.full_word_bank.shape[1]
+        if len(guess) != word_length or len(information) != word_length:
+            raise ValueError(
+                f"Expected a {word_length}-letter guess with {word_length} feedback values, "
+                f"got {len(guess)} letters and {len(information)} feedback values."
+            )
+        guess = np.asarray(guess, dtype=np.int64)
+        trits = np.array([FEEDBACK_VALUES[color] for color in information], dtype=np.int8)
+
+        guess_row = self.word_row(guess) if self.pattern_table_loaded else None
+        kernels = _optional_kernels('_cull_numba')
+        if guess_row is not None:
+            # The guess's feedback against every word is already in the loaded pattern table
+            keep = self._gather_possible(self._pattern_table[guess_row]) == encode_feedback(information)
+        elif kernels._NUMBA_AVAILABLE:
+            keep = np.empty(len(self.possible_indices), dtype=bool)
+            kernels.cull_kernel(self.full_word_bank, self.possible_indices, guess, trits, keep)
+        else:
+            keep = self._candidate_mask(guess, trits)
+            if len(set(guess.tolist())) < len(guess):
+                # The checks are only exact for distinct letters, repeated ones need the full feedback rule
+                candidates = np.flatnonzero(keep)
+                candidate_patterns = pattern_ids(guess[None, :], self.possible_word_bank[candidates])[0]
+                keep[candidates] = candidate_patterns == encode_feedback(information)
+
+        self._keep(keep)
 
     def decode_word(self, word: NDArray) -> str:
         """Converts a numpy array of integers back to a string using the stored ascii converter key value."""
-        return "".join(chr(char + self.ascii_converter_key) for char in word)
+        return "".join([self._characters[char] for char in np.asarray(word).tolist()])
 
     def encode_word(self, word: str) -> NDArray:
         """Converts string into a numpy array of integers using the stored ascii converter key value."""
-        return np.array([ord(char.lower()) - self.ascii_converter_key for char in word])  # Convert guess to ascii
+        word = word.lower()
+        try:
+            return np.array([self._char_codes[char] for char in word])
+        except KeyError:  # Characters past the lookup table can't be in the word bank, but still get their offset
+            return np.array([ord(char) - self.ascii_converter_key for char in word])
 
     def reset(self) -> None:
-        """Resets the possible words list to the full original list."""
-        self.possible_word_bank = self.full_word_bank.copy()
+        """Resets the possible words list to the full original list (without allocating a new one)."""
+        self._set_possible_indices(self._all_indices)
@@ -1,6 +1,9 @@
 import numpy as np
 from numpy.typing import NDArray
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from wordle_buddy.utils import _optional_kernels
+from wordle_buddy.utils.feedback_patterns import entropies_from_ids, num_patterns, pattern_id_matrix, table_entropies
 
 if TYPE_CHECKING:
     from wordle_buddy.utils.word_bank_manager import WordBankManager
@@ -24,12 +27,28 @@ class WordScorerEntropy:
         self.hparams = hparams
         self.hardcore_mode = hardcore_mode
 
-        # Find all unique characters and generate a hash table
-        unique_chars = sorted(np.unique(self.word_bank.full_word_bank))
-        self.char_map = {char: idx for idx, char in enumerate(unique_chars)}
+        # Character to alphabet index map, precomputed when the word bank loads. Scoring works on the
+        # alphabet-ranked word bank, so the letter tables have one row per letter of the alphabet
+        self.char_map = self.word_bank.char_map
+        self.num_letters = len(self.word_bank.alphabet)
+
+        # Scratch buffers reused across attempts, sized for the full word bank and sliced per call
+        num_words, word_length = self.word_bank.full_word_bank.shape
+        self._word_entropies_buffer = np.empty((num_words, word_length))
+        self._scores_buffer = np.empty(num_words)
+
+        # Index constants of the full word bank, so scoring doesn't rebuild them every turn
+        self._full_word_indices = np.arange(num_words)
+        self._positions = np.arange(word_length)
 
-        # Dynamically determine the highest Unicode character used
-        self.max_unicode = np.max(self.word_bank.full_word_bank)  # Get max Unicode value from word bank
+        # Feedback pattern ids of the last reranked guesses, by word bank row: (answer indices, pattern ids)
+        self._pattern_cache = {}
+
+        # Compile the optional Numba kernels up front rather than on the first scored turn
+        # (the pattern kernels only when reranking is enabled, otherwise they compile on first use)
+        _optional_kernels('_scoring_numba').warmup()
+        if self.hparams.pattern_entropy:
+            _optional_kernels('_scoring_numba').warmup_pattern_kernels()
 
     def toggle_mode(self, hardcore_mode: bool) -> None:
         """
@@ -46,14 +65,41 @@ class WordScorerEntropy:
         else:
             return self.word_bank.full_word_bank
 
+    @property
+    def current_alphabet_word_bank(self) -> NDArray:
+        """`current_word_bank` with letters as alphabet ranks."""
+        if self.hardcore_mode == True:
+            return self.word_bank.possible_alphabet_word_bank
+        else:
+            return self.word_bank.full_alphabet_word_bank
+
+    @property
+    def current_word_indices(self) -> NDArray:
+        """Rows of `current_word_bank` within the full word bank."""
+        if self.hardcore_mode == True:
+            return self.word_bank.possible_indices
+        else:
+            return self._full_word_indices
+
     def _precompute_letter_frequencies(self) -> NDArray:
         """Counts the frequency of each letter in each position across the list of words in the current word bank."""
-        # Vectorized counting operation
-        char_freq_table = np.zeros((self.max_unicode + 1, 5), dtype=np.int32)
-
-        char_freq_table.fill(0)  # Reset frequencies
-        for pos in range(self.word_bank.possible_word_bank.shape[1]):
-            np.add.at(char_freq_table, (self.word_bank.possible_word_bank[:, pos], pos), 1)
+        possible_word_bank = self.word_bank.possible_alphabet_word_bank
+
+        kernels = _optional_kernels('_scoring_numba')
+        if kernels._NUMBA_AVAILABLE:
+            # All positions counted in one pass over the words
+            char_freq_table = np.empty((self.num_letters, possible_word_bank.shape[1]), dtype=np.int32)
+            kernels.letter_frequencies_kernel(possible_word_bank, char_freq_table)
+            return char_freq_table
+
+        # One bincount per position (a tight C loop, unlike the unbuffered np.add.at)
+        char_freq_table = np.stack(
+            [
+                np.bincount(possible_word_bank[:, pos], minlength=self.num_letters)
+                for pos in range(possible_word_bank.shape[1])
+            ],
+            axis=1
+        ).astype(np.int32, copy=False)
 
         return char_freq_table
 
@@ -68,21 +114,34 @@ class WordScorerEntropy:
 
         total_viable_words = len(self.word_bank.possible_word_bank)  # Total number of words (of the viable guesses)
 
-        # Probabilities for Green, Yellow, and White entropies
-        p_green = char_freq_table / total_viable_words
-        p_yellow = (total_char_freq_table[:, None] - char_freq_table) / total_viable_words
-        p_white = 1 - total_char_freq_table / total_viable_words
+        # Probabilities for Green, Yellow, and White entropies, laid out in one flat array
+        # so the entropy below is a single pass instead of one per color
+        num_chars, word_length = char_freq_table.shape
+        table_size = num_chars * word_length
+        probabilities = np.empty(2 * table_size + num_chars)
+        p_green = probabilities[:table_size].reshape(num_chars, word_length)
+        p_yellow = probabilities[table_size:2 * table_size].reshape(num_chars, word_length)
+        p_white = probabilities[2 * table_size:]
+        np.divide(char_freq_table, total_viable_words, out=p_green)
+        np.divide(total_char_freq_table[:, None] - char_freq_table, total_viable_words, out=p_yellow)
+        np.subtract(1, total_char_freq_table / total_viable_words, out=p_white)
 
         # Clip to ensure probabilities are between 0 and 1
         epsilon = 1e-10
-        p_green = np.clip(p_green, epsilon, 1 - epsilon)
-        p_yellow = np.clip(p_yellow, epsilon, 1 - epsilon)
-        p_white = np.clip(p_white, epsilon, 1 - epsilon)
+        np.clip(probabilities, epsilon, 1 - epsilon, out=probabilities)
 
         # Compute entropy safely using binary entropy formula H(p) = -p log2(p) - (1-p) log2(1-p)
-        green_entropy = -p_green * np.log2(p_green) - (1 - p_green) * np.log2(1 - p_green)
-        yellow_entropy = -p_yellow * np.log2(p_yellow) - (1 - p_yellow) * np.log2(1 - p_yellow)
-        white_entropy = -p_white * np.log2(p_white) - (1 - p_white) * np.log2(1 - p_white)
+        complements = 1 - probabilities
+        entropies = np.log2(probabilities)
+        entropies *= probabilities
+        np.log2(complements, out=probabilities)  # p is no longer needed, reuse it for the (1-p) log2(1-p) term
+        probabilities *= complements
+        entropies += probabilities
+        np.negative(entropies, out=entropies)
+
+        green_entropy = entropies[:table_size].reshape(num_chars, word_length)
+        yellow_entropy = entropies[table_size:2 * table_size].reshape(num_chars, word_length)
+        white_entropy = entropies[2 * table_size:]
 
         # Expand white entropy so it is for every character position
         white_entropy = np.broadcast_to(white_entropy[:, None], green_entropy.shape)
@@ -93,13 +152,13 @@ class WordScorerEntropy:
             self,
             attempt_num: int,
             green_entropy: NDArray, yellow_entropy: NDArray, white_entropy: NDArray
-    ) -> NDArray:
+    ) -> Tuple[NDArray, Optional[NDArray]]:
         """
         Applies hyperparameters to the entropy calculations, vectorized for efficiency
 
         - Penalizes repeated letters progressively in yellow entropy
         - Averages white entropy across repeated instances
-        - Boosts entropy for words that could be the correct answer
+        - Flags the words that could be the correct answer, once only those should be guessed
 
         Args:
             - attempt_num: Current attempt number (used for weighting)
@@ -108,85 +167,138 @@ class WordScorerEntropy:
             - white_entropy: White entropy scores for all words
         Returns:
             - NDArray: Adjusted word entropies
+            - NDArray: Per-word potential answer mask to apply to the summed scores (None when all words are allowed)
         """
-        # per-word character frequency calculation
-        num_viable_words, word_length = self.working_word_bank.shape
-        per_word_char_frequencies = np.zeros((num_viable_words, self.max_unicode + 1), dtype=int)
-
-        # Efficiently count character occurrences per word using np.add.at()
-        np.add.at(per_word_char_frequencies, (np.arange(num_viable_words)[:, None], self.working_word_bank), 1)
-
-        # Extract frequency counts for each character in its respective position
-        char_frequencies = np.take_along_axis(per_word_char_frequencies, self.working_word_bank, axis=1)  # Shape: (num_viable_words, 5)
-
-        # Compute smoothed yellow entropy penalty
-        yellow_penalty = (1 + (1 / char_frequencies)) / 2  # Progressive but softer penalty
-
-        # Compute white entropy averaging (unchanged)
-        white_penalty = np.where(char_frequencies > 0, 1 / char_frequencies, 1)
-
-        word_entropies = (
-                green_entropy[self.working_word_bank, np.arange(word_length)] +
-                yellow_entropy[self.working_word_bank, np.arange(word_length)] * yellow_penalty +
-                white_entropy[self.working_word_bank, np.arange(word_length)] * white_penalty
-        )
-
-
-
-        non_valid_penalty = 1.0
-        if self.word_bank.possible_word_bank.shape[0] <= 2 or attempt_num == self.hparams.max_guesses:
-            # Identify potential answers and apply weighting
-            is_potential_answer = np.isin(
-                self.working_word_bank.view(f'V{self.working_word_bank.shape[1] * 4}'),
-                self.word_bank.possible_word_bank.view(f'V{self.working_word_bank.shape[1] * 4}')
+        working_word_bank = self.current_alphabet_word_bank
+        num_viable_words, word_length = working_word_bank.shape
+        kernels = _optional_kernels('_scoring_numba')
+        if kernels._NUMBA_AVAILABLE:
+            # Fused kernel: counts repeated letters per word in registers, no (N, chars) temporaries
+            word_entropies = self._word_entropies_buffer[:num_viable_words]
+            kernels.word_entropies_kernel(
+                working_word_bank,
+                green_entropy, yellow_entropy, np.ascontiguousarray(white_entropy),
+                word_entropies
             )
-            is_potential_answer = np.broadcast_to(
-                is_potential_answer, self.working_word_bank.shape
-            )
-            # if there are less than two words left...or it is our last guess just punt it
-            word_entropies *= np.where(is_potential_answer, 1, 0)
-
-        return word_entropies
-
-    def _apply_hparams_old(self, green_entropy, yellow_entropy, white_entropy):
-        weighted_entropy = green_entropy + yellow_entropy + white_entropy
-        word_entropies = weighted_entropy[self.working_word_bank, np.arange(self.working_word_bank.shape[1])]
+        else:
+            # Count how often each word's character at each position appears within that word: one
+            # comparison per position, with no (num_viable_words, num_letters) table of per-word counts
+            char_frequencies = np.zeros(working_word_bank.shape, dtype=np.intp)  # Shape: (num_viable_words, 5)
+            for position in range(working_word_bank.shape[1]):
+                char_frequencies += working_word_bank == working_word_bank[:, position:position + 1]
 
-        for i, word in enumerate(self.working_word_bank):
-            # For each word, identify unique characters
-            unique_chars, counts = np.unique(word, return_counts=True)
+            # Compute smoothed yellow entropy penalty
+            yellow_penalty = (1 + (1 / char_frequencies)) / 2  # Progressive but softer penalty
 
-            for char_idx, count in zip(unique_chars, counts):
-                # Get the positions where the current character appears
-                char_positions = np.where(word == char_idx)[0]  # Get positions for this character
+            # Compute white entropy averaging (unchanged)
+            white_penalty = np.where(char_frequencies > 0, 1 / char_frequencies, 1)
 
-                yellow_penalty = (1 + (1 / count)) / 2
-                white_penalty = 1 / count
+            # Stack the (char, position) tables once per attempt so a single gather scores the whole word bank
+            entropy_tables = np.stack((green_entropy, yellow_entropy, white_entropy))
+            word_green, word_yellow, word_white = entropy_tables[:, working_word_bank, self._positions]
 
-                # Apply the diminishing factor to yellow entropy for repeated characters
-                for idx, pos in enumerate(char_positions):
+            word_entropies = word_green + word_yellow * yellow_penalty + word_white * white_penalty
 
-                    word_entropies[i, pos] = green_entropy[char_idx, pos] + yellow_entropy[char_idx, pos] * yellow_penalty + white_entropy[char_idx] * white_penalty
+        is_potential_answer = None
+        if not self.hardcore_mode and (
+                len(self.word_bank.possible_indices) <= 2 or attempt_num == self.hparams.max_guesses
+        ):
+            # if there are less than two words left...or it is our last guess just punt it
+            # (potential answers identified by their word bank rows, no word comparisons; hardcore
+            # mode only scores possible answers, so the mask would be all True there)
+            is_potential_answer = self.word_bank.is_possible(self.current_word_indices)
 
-        return word_entropies
+        return word_entropies, is_potential_answer
 
     def score_word_bank(self, attempt_num: int) -> NDArray:
         """
         Scores all words in the word bank simultaneously using vectorized entropy calculations.
         Weights the word entropies based on the hyperparameters
 
-        :return: NumPy array containing scores for all words.
+        :return: NumPy array containing scores for all words (a reused buffer, valid until the next call).
         """
         self.working_word_bank = self.current_word_bank
         green_entropy, yellow_entropy, white_entropy = self._calculate_entropy_scores()
 
         # Weight the entropies based on the hyperparameters
-        word_entropies = self._apply_hyperparameters(
+        word_entropies, is_potential_answer = self._apply_hyperparameters(
             attempt_num,
             green_entropy, yellow_entropy, white_entropy
         )
 
         # Sum entropies across positions for each word
-        scores = np.sum(word_entropies, axis=1)
+        scores = np.sum(word_entropies, axis=1, out=self._scores_buffer[:len(word_entropies)])
+        if is_potential_answer is not None:
+            scores *= is_potential_answer  # Zeroes whole words, so it is applied once per word after the sum
+
+        if self.hparams.pattern_entropy:
+            scores = self._rerank_by_pattern_entropy(scores)
 
         return scores
+
+    def _rerank_by_pattern_entropy(self, scores: NDArray) -> NDArray:
+        """
+        Reranks the best positional guesses by their true expected information gain, i.e. the entropy
+        of the feedback patterns they would produce across the remaining possible words.
+
+        The positional scores prune the candidates (`hparams.pattern_entropy_candidates`) so only a
+        handful of guesses pay for the full pattern computation. Reranking every guess instead reads
+        the patterns from the word bank's cached pattern table, as do the candidates once it is loaded.
+
+        :param scores: Positional entropy scores for the working word bank.
+        :return: Scores where the reranked candidates sit above every other word, ordered by information gain.
+        """
+        candidates = np.flatnonzero(scores > 0)
+        num_candidates = self.hparams.pattern_entropy_candidates
+        if 0 < num_candidates < len(candidates):
+            candidates = candidates[np.argpartition(scores[candidates], -num_candidates)[-num_candidates:]]
+        if len(candidates) == 0:
+            return scores
+
+        if num_candidates == 0 or self.word_bank.pattern_table_loaded:
+            information_gain = table_entropies(
+                self.word_bank.pattern_table,
+                self.current_word_indices[candidates],
+                self.word_bank.possible_indices,
+                self.working_word_bank.shape[1],
+                use_gpu=self.hparams.pattern_entropy_gpu
+            )
+        else:
+            information_gain = self._candidate_pattern_entropies(
+                self.current_word_indices[candidates], self.working_word_bank[candidates]
+            )
+
+        reranked = scores.copy()
+        reranked[candidates] = scores.max() + information_gain
+        return reranked
+
+    def _candidate_pattern_entropies(self, guess_rows: NDArray, guesses: NDArray) -> NDArray:
+        """
+        Pattern entropies of the candidate guesses against the possible words.
+
+        The possible words only shrink during a game, so a candidate's pattern ids from an earlier
+        turn still cover every remaining answer and are reused by selecting their columns; only new
+        candidates (or every one, after a reset) have their patterns computed.
+
+        :param guess_rows: Word bank rows of the candidate guesses.
+        :param guesses: The encoded candidate guesses.
+        :return: (len(guess_rows),) array of entropies.
+        """
+        answers = self.word_bank.possible_indices
+        total_patterns = num_patterns(guesses.shape[1])
+        ids = np.empty((len(guess_rows), len(answers)), dtype=np.min_scalar_type(total_patterns - 1))
+
+        uncached = []
+        for i, row in enumerate(guess_rows):
+            cached_answers, cached_ids = self._pattern_cache.get(row, (answers[:0], None))
+            columns = np.minimum(np.searchsorted(cached_answers, answers), len(cached_answers) - 1)
+            if len(cached_answers) and np.array_equal(cached_answers[columns], answers):
+                ids[i] = cached_ids[columns]
+            else:
+                uncached.append(i)
+
+        if uncached:
+            ids[uncached] = pattern_id_matrix(guesses[uncached], self.word_bank.possible_word_bank)
+
+        self._pattern_cache = {row: (answers, ids[i]) for i, row in enumerate(guess_rows)}
+        return entropies_from_ids(ids, total_patterns)